@@ -23,13 +23,16 @@ from __future__ import absolute_import
 
 import logging
 import logging.handlers
-import copy
 
+import io
 import os
+import sys
+import array
+import threading
+import time
 import numpy as np
 
 from collections import OrderedDict
-from datetime import datetime
 from contextlib import contextmanager
 
 from pyexperiment.utils.Singleton import Singleton
@@ -60,16 +63,46 @@ CONSOLE_STREAM_HANDLER = logging.StreamHandler()
 """
 
 
+def _detect_color():
+    """Check if the console should be colored: forced by CLICOLOR_FORCE,
+    disabled by NO_COLOR, otherwise only if stderr is a terminal
+    """
+    if os.environ.get('CLICOLOR_FORCE', '0') != '0':
+        return True
+    if 'NO_COLOR' in os.environ:
+        return False
+    isatty = getattr(sys.stderr, 'isatty', None)
+    return isatty is not None and isatty()
+
+
+USE_COLOR = _detect_color()
+"""Whether the console output is colored, detected once at import
+"""
+
+TIMER = getattr(time, 'perf_counter', time.time)
+"""The clock used to time blocks (perf_counter is missing in python 2)
+"""
+
+
 class ColorFormatter(logging.Formatter):
     """Formats logged messages with optional added color for the log level
     """
-    def __init__(self, msg, use_color=True):
+    def __init__(self, msg, use_color=USE_COLOR):
         """Initializer
         """
         super(ColorFormatter, self).__init__(msg)
         self.use_color = use_color
-        self.log_no = 0
         self.colors = self._setup_log_level_colors()
+        self.colored_levelnames = dict(
+            (levelname, printers.colorize(levelname, color))
+            for levelname, color in self.colors.items())
+        # The format string is fixed, so look for the time field only once
+        self._uses_time = super(ColorFormatter, self).usesTime()
+
+    def usesTime(self):
+        """Check if the format uses the creation time of the record
+        """
+        return self._uses_time
 
     @staticmethod
     def _setup_log_level_colors():
@@ -85,23 +118,58 @@ class ColorFormatter(logging.Formatter):
         """Format the log
         """
         levelname = record.levelname
-        if self.use_color and levelname in self.colors:
-            levelname_color = printers.colorize(levelname,
-                                                self.colors[levelname])
-
-            relative_color = ("%0.3fs" % (record.relativeCreated / 1000.0))
-            self.log_no += 1
-            record = copy.copy(record)
-            record.levelname = levelname_color
-            record.relativeCreated = relative_color
-            return logging.Formatter.format(self, record)
+        relative_created = record.relativeCreated
+        colored_levelname = (self.colored_levelnames.get(levelname)
+                             if self.use_color else None)
+        if colored_levelname is not None:
+            record.levelname = colored_levelname
+            record.relativeCreated = ("%0.3fs" % (relative_created / 1000.0))
         else:
-            levelname_short = levelname[0]
-            relative_s = record.relativeCreated / 1000.0
-            record = copy.copy(record)
-            record.levelname = levelname_short
-            record.relativeCreated = relative_s
+            record.levelname = levelname[0]
+            record.relativeCreated = relative_created / 1000.0
+
+        # Format with the modified attributes, then restore the record
+        try:
             return logging.Formatter.format(self, record)
+        finally:
+            record.levelname = levelname
+            record.relativeCreated = relative_created
+
+
+class BatchRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """Rotating file handler that leaves flushing to flush_batch, so that
+    a batch of records is written with a single flush
+    """
+    BUFFER_SIZE = 64 * 1024
+    """Size of the buffer for the log file
+    """
+
+    def _open(self):
+        """Open the log file with a buffer large enough for a batch
+        """
+        if self.encoding is None:
+            return open(self.baseFilename, self.mode, self.BUFFER_SIZE)
+        return io.open(self.baseFilename,
+                       self.mode,
+                       self.BUFFER_SIZE,
+                       encoding=self.encoding,
+                       errors=getattr(self, 'errors', None))
+
+    def flush(self):
+        """Records are flushed by flush_batch
+        """
+        pass
+
+    def flush_batch(self):
+        """Flush the records written so far
+        """
+        super(BatchRotatingFileHandler, self).flush()
+
+    def close(self):
+        """Flush, then close the file
+        """
+        self.flush_batch()
+        super(BatchRotatingFileHandler, self).close()
 
 
 class MPRotLogHandler(logging.Handler):
@@ -123,7 +191,7 @@ class MPRotLogHandler(logging.Handler):
         file_formatter = ColorFormatter(
             FILE_FORMAT, False)
         # Setup the actual handler for the log files
-        self._file_handler = logging.handlers.RotatingFileHandler(
+        self._file_handler = BatchRotatingFileHandler(
             filename=filename,
             backupCount=no_backups)
         self._file_handler.setLevel(level)
@@ -132,8 +200,9 @@ class MPRotLogHandler(logging.Handler):
         if roll_over_file:
             self._file_handler.doRollover()
 
-        # Emit messages in the main process
-        self._delegate_emit = DelegateCall(self._file_handler.emit)
+        # Emit messages in the main process, flushing after each batch
+        self._delegate_emit = DelegateCall(self._emit_record,
+                                           self._file_handler.flush_batch)
 
     def setFormatter(self, formatter):
         """Overload the setFormatter method"""
@@ -142,6 +211,7 @@ class MPRotLogHandler(logging.Handler):
 
     def close(self):
         self._delegate_emit.join()
+        self._delegate_emit.close()
         self._file_handler.close()
         super(MPRotLogHandler, self).close()
 
@@ -155,11 +225,20 @@ class MPRotLogHandler(logging.Handler):
             record.msg = record.msg % record.args
             record.args = None
         if record.exc_info:
-            record.exc_text = self.format(record)
+            if not record.exc_text:
+                record.exc_text = self.formatter.formatException(
+                    record.exc_info)
             record.exc_info = None
 
         return record
 
+    def _emit_record(self, record):
+        """Writes a record to the file, errors are flushed right away
+        """
+        self._file_handler.emit(record)
+        if record.levelno >= logging.ERROR:
+            self._file_handler.flush_batch()
+
     def emit(self, record):
         """Emits logged message by delegating it
         """
@@ -207,7 +286,7 @@ class Logger(logging.Logger, DefaultSingleton):
             level=min(console_level, file_level))
 
         # Setup console logging
-        def expand_format_tags(message, use_color=True):
+        def expand_format_tags(message, use_color=USE_COLOR):
             """Expands $*SEQ tags in a string. If use_color is False, removes
             the tags.
             """
@@ -221,7 +300,7 @@ class Logger(logging.Logger, DefaultSingleton):
             return message
 
         color_formatter = ColorFormatter(
-            expand_format_tags(CONSOLE_FORMAT, True))
+            expand_format_tags(CONSOLE_FORMAT, USE_COLOR), USE_COLOR)
 
         console_handler = CONSOLE_STREAM_HANDLER
         console_handler.setLevel(console_level)
@@ -266,6 +345,39 @@ class Logger(logging.Logger, DefaultSingleton):
         return temp_logger
 
 
+class TimingStatistics(object):
+    """Statistics of the timings of one timed block
+    """
+    __slots__ = ['count', 'total', 'min', 'max', 'samples']
+
+    def __init__(self):
+        """Initializer
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        # Unboxed samples for the exact median
+        self.samples = array.array('d')
+
+    def add(self, elapsed_time):
+        """Add a new sample
+        """
+        self.count += 1
+        self.total += elapsed_time
+        if elapsed_time < self.min:
+            self.min = elapsed_time
+        if elapsed_time > self.max:
+            self.max = elapsed_time
+        self.samples.append(elapsed_time)
+
+    @property
+    def median(self):
+        """The median of the timings
+        """
+        return np.median(np.frombuffer(self.samples, dtype=np.float64))
+
+
 class TimingLogger(Logger):
     """Provides a logger with a `timed` context.
 
@@ -288,6 +400,9 @@ class TimingLogger(Logger):
         """
         # Container and aggregator for the timings
         self.timings = OrderedDict()
+        self._timings_lock = threading.Lock()
+        # Timings from other processes are passed through the delegate
+        self._pid = os.getpid()
         self._delegate_process_timings = DelegateCall(self._process_timings)
         super(TimingLogger, self).__init__(console_level,
                                            filename,
@@ -301,20 +416,22 @@ class TimingLogger(Logger):
         captures the result in the timings dictionary.
         """
         # At the start of the with block
-        start = datetime.now()
+        start = TIMER()
         yield
         # After leaving the with block
-        stop = datetime.now()
-        elapsed_time = (stop - start).total_seconds()
+        elapsed_time = TIMER() - start
 
         # Log if necessary
-        if level is not None:
+        if level is not None and self.isEnabledFor(level):
             self.log(level,
                      msg + " took %0.6fs" % elapsed_time)
 
         # Save result if necessary
         if save_result:
-            self._delegate_process_timings((msg, elapsed_time))
+            if os.getpid() == self._pid:
+                self._process_timings((msg, elapsed_time))
+            else:
+                self._delegate_process_timings((msg, elapsed_time))
 
     def print_timings(self):
         """Prints a summary of the timings collected with 'timed'.
@@ -322,28 +439,30 @@ class TimingLogger(Logger):
         # Make sure the delegated calls are done
         self._delegate_process_timings.join()
 
-        if len(self.timings.items()) > 0:
-            # Announce timings
-            printers.print_blue(  # pylint: disable=no-member
-                "Timing Summary:")
-
-            # Iterate over all saved timings
-            for msg, times in self.timings.items():
-                no_timings = len(times)
-                if no_timings > 1:
-                    times_array = np.array(times)
+        # Format the saved timings while no new ones can be added
+        messages = []
+        with self._timings_lock:
+            for msg, stats in self.timings.items():
+                if stats.count > 1:
                     message = ("\t'%s' (timed %d times): "
                                "total = %0.6fs, "
                                "min = %0.6fs, max = %0.6fs, median = %0.6fs"
                                % (msg,
-                                  no_timings,
-                                  np.sum(times_array),
-                                  np.min(times_array),
-                                  np.max(times_array),
-                                  np.median(times_array)))
+                                  stats.count,
+                                  stats.total,
+                                  stats.min,
+                                  stats.max,
+                                  stats.median))
                 else:
-                    message = "\t'%s': %0.6fs" % (msg, times[0])
+                    message = "\t'%s': %0.6fs" % (msg, stats.total)
+                messages.append(message)
 
+        if len(messages) > 0:
+            # Announce timings
+            printers.print_blue(  # pylint: disable=no-member
+                "Timing Summary:")
+
+            for message in messages:
                 print(message)
         else:
             printers.print_blue(  # pylint: disable=no-member
@@ -356,13 +475,14 @@ class TimingLogger(Logger):
         msg, elapsed_time = data
 
         # Save the result
-        if msg not in self.timings:
-            self.timings[msg] = [elapsed_time]
-        else:
-            self.timings[msg].append(elapsed_time)
+        with self._timings_lock:
+            if msg not in self.timings:
+                self.timings[msg] = TimingStatistics()
+            self.timings[msg].add(elapsed_time)
 
     def close(self):
         """Make sure the delegated calls are all done...
         """
         self._delegate_process_timings.join()
+        self._delegate_process_timings.close()
         super(TimingLogger, self).close()
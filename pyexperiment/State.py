@@ -65,21 +65,33 @@ class State(Singleton,  # pylint: disable=too-many-ancestors
         self.filename = filename
         self.lazy = True if filename is not None else False
         self.raise_ioerror_on_load = True
+        # Read-only handle of the file, kept open for lazy loading
+        self._h5file = None
+
+    def close_file(self):
+        """Close the file kept open for lazy loading
+        """
+        if self._h5file is not None:
+            self._h5file.close()
+            self._h5file = None
 
     def __load_from_file(self, key):
         """Try to get a value from disk
         """
         try:
-            with h5py.File(self.filename, "r") as h5file:
-                h5name = "state/" + "/".join(key.split(self.SECTION_SEPARATOR))
-                if not isinstance(h5file[h5name], h5py.Group):
-                    if (('type' in h5file[h5name].attrs
-                         and h5file[h5name].attrs['type'] == 'ndarray')):
-                        value = h5file[h5name].value
-                    else:  # must be a pickled array
-                        value = pickle.loads(h5file[h5name].value.tostring())
-                    self.__setitem__(key, value)
-                    self.changed.remove(key)
+            if self._h5file is None:
+                self._h5file = h5py.File(self.filename, "r")
+            h5file = self._h5file
+            h5name = "state/" + "/".join(key.split(self.SECTION_SEPARATOR))
+            if not isinstance(h5file[h5name], h5py.Group):
+                if (('type' in h5file[h5name].attrs
+                     and h5file[h5name].attrs['type'] == 'ndarray')):
+                    value = h5file[h5name][()]
+                else:  # must be a pickled array
+                    value = pickle.loads(h5file[h5name][()].tobytes())
+                # Loaded values are unchanged, and should not go through
+                # __setitem__, which state contexts may replace
+                super(State, self).__setitem__(key, value)
         except IOError as err:
             if self.raise_ioerror_on_load:
                 raise IOError(
@@ -117,7 +129,10 @@ class State(Singleton,  # pylint: disable=too-many-ancestors
                 descendants = filter(partial(is_descendant, key),
                                      self.keys())
                 for descendant in descendants:
-                    self.__load_from_file(descendant)
+                    # Values loaded before are not unpickled again
+                    if super(State, self).__getitem__(descendant) \
+                       is UNLOADED:
+                        self.__load_from_file(descendant)
 
                 value = super(State, self).__getitem__(key)
 
@@ -152,10 +167,9 @@ class State(Singleton,  # pylint: disable=too-many-ancestors
     def __iter__(self):
         """Overload HierarchicalOrderedDict's __iter__
         """
-        # Use filter with super's __getitem__ to exclude deleted keys
-        return filter(lambda x: super(State, self).__getitem__(x)
-                      is not DELETED,
-                      super(State, self).__iter__())
+        # Exclude deleted keys, checking the values in the same walk
+        return (key for key, value in self._iter_items()
+                if value is not DELETED)
 
     def do_rollover(self, filename, rotate_n_state_files=0):
         """Rotate state files (as in logging module). Preserves the content of
@@ -204,6 +218,8 @@ class State(Singleton,  # pylint: disable=too-many-ancestors
         """
         if not self.need_saving():
             return
+        # The file cannot be written while it is open for reading
+        self.close_file()
         self.do_rollover(filename, rotate_n_state_files)
         log.debug("Saving state to file: '%s'", filename)
 
@@ -235,7 +251,7 @@ class State(Singleton,  # pylint: disable=too-many-ancestors
                                     pickled_state = pickle.dumps(
                                         value,
                                         protocol=pickle.HIGHEST_PROTOCOL)
-                                    state_array = np.fromstring(pickled_state,
+                                    state_array = np.frombuffer(pickled_state,
                                                                 dtype=np.uint8)
                                     ds_type = 'pickle'
 
@@ -284,6 +300,7 @@ class State(Singleton,  # pylint: disable=too-many-ancestors
         """Loads state from a h5f file
         """
         # Reset state
+        self.close_file()
         self.raise_ioerror_on_load = raise_error
         self.lazy = lazy
 
@@ -301,6 +318,7 @@ class State(Singleton,  # pylint: disable=too-many-ancestors
             if not self.lazy:
                 for key in self.keys():
                     self.__load_from_file(key)
+                self.close_file()
             self.changed = set()
         except IOError as err:
             if self.raise_ioerror_on_load:
@@ -389,6 +407,8 @@ class StateHandler(object):
                     compression_level=self.COMPRESSION_LEVEL)
 
         finally:
+            # Others may write to the file once it is unlocked
+            State.get_instance().close_file()
             # Release the state lock if we have it
             if self.state_lock is not None:
                 self.unlock()
@@ -22,8 +22,10 @@ try:
 except ImportError:
     AUTO_COMPLETION = False
 from contextlib import contextmanager
-from inspect import getargspec
+import inspect
 import multiprocessing
+# Python 2 compatibility
+GETARGSPEC = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
 
 from pyexperiment import conf
 from pyexperiment import log
@@ -65,6 +67,11 @@ DEFAULT_CONFIG_SPECS = ("[pyexperiment]\n"
 """Default specification for the experiment's configuration
 """
 
+_DEFAULT_CONFIG_SPEC_LINES = tuple(
+    option.encode() for option in DEFAULT_CONFIG_SPECS.split('\n'))
+"""The default specification as encoded lines, as expected by configure
+"""
+
 DEFAULT_CONFIG_FILENAME = "./config.ini"
 """Default name for the configuration file
 """
@@ -113,14 +120,14 @@ def logging_context():
 def help(*args):  # pylint:disable=W0622
     """Shows help for a specified command.
     """
-    help_dict = dict([(command.__name__,
-                       command.__doc__) for command in COMMANDS])
     if len(args) == 0:
         print("To get help on a command, use %s help COMMAND" %
               sys.argv[0].replace("./", ""))
     else:
-        if args[0] in help_dict.keys():
-            print(help_dict[args[0]])
+        for command in COMMANDS:
+            if command.__name__ == args[0]:
+                print(command.__doc__)
+                break
         else:
             print("Command '%s' not available." % args[0])
 
@@ -205,6 +212,19 @@ def activate_autocompletion():
     print(out)
 
 
+def _count_args(function):
+    """Returns the number of positional arguments a function takes
+    """
+    try:
+        no_args = function.__code__.co_argcount
+    except AttributeError:
+        # E.g., functools.partial or callable objects
+        return len(GETARGSPEC(function).args)
+    if inspect.ismethod(function):
+        no_args -= 1
+    return no_args
+
+
 def collect_commands(default, commands):
     """Add default commands
     """
@@ -215,7 +235,7 @@ def collect_commands(default, commands):
                         save_config,
                         show_state]
 
-    if default is not None and len(getargspec(default).args) > 0:
+    if default is not None and _count_args(default) > 0:
         raise TypeError("Main function cannot take arguments.")
 
     def show_commands():
@@ -246,7 +266,7 @@ def format_command_help(default, commands):
               "".join(["  "
                        + "%-22s" % (command.__name__
                                     + (' (default)'
-                                       if command == default else '')
+                                       if command is default else '')
                                     + ':')
                        + "".join(command.__doc__.replace(
                            "\n    ", " ").split(".")[0])
@@ -339,28 +359,23 @@ def setup_arg_parser(default, commands, description):
 def handle_shortcuts(args):
     """Handle argument shortcuts
     """
+    if args.option is None:
+        args.option = []
+
     # Handle verbosity
     if args.verbosity is not None:
-        if args.option is None:
-            args.option = []
         args.option.append(('pyexperiment.verbosity',
                             args.verbosity))
     elif args.v:
-        if args.option is None:
-            args.option = []
         args.option.append(('pyexperiment.verbosity',
                             'DEBUG'))
     # Handle --processes
     if args.processes:
-        if args.option is None:
-            args.option = []
         args.option.append(('pyexperiment.n_processes',
                             str(args.processes[0])))
 
     # Handle --print-timings
     if args.print_timings:
-        if args.option is None:
-            args.option = []
         args.option.append(('pyexperiment.print_timings',
                             'True'))
 
@@ -380,8 +395,7 @@ def configure(default, commands, config_specs, description):
                     [option.encode()
                      for option in config_specs.split('\n')],
                     args.option,
-                    [option.encode()
-                     for option in DEFAULT_CONFIG_SPECS.split('\n')])
+                    _DEFAULT_CONFIG_SPEC_LINES)
 
     actual_command = default
     if args.command is not None:
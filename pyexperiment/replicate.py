@@ -15,10 +15,10 @@ from __future__ import absolute_import
 import multiprocessing
 import functools
 import traceback
-import threading
 
 from pyexperiment.state_context import substate_context
 from pyexperiment.state_context import processing_state_context
+from pyexperiment.State import State
 from pyexperiment import conf
 from pyexperiment import state
 from pyexperiment import log
@@ -45,9 +45,8 @@ def _replicate_single_thread(function,
 class TargetCreator(object):  # pylint: disable=too-few-public-methods
     """Creates a target for a multiprocessed replicate
     """
-    def __init__(self, target, ready_queue, context):
+    def __init__(self, target, context):
         self.target = target
-        self.ready_queue = ready_queue
         self.context = context
         try:
             functools.update_wrapper(self, target)
@@ -56,16 +55,34 @@ class TargetCreator(object):  # pylint: disable=too-few-public-methods
 
     def __call__(self):
         with substate_context(self.context):
-            self.ready_queue.put(True)
             log.debug("Running " + self.context)
             try:
                 result = self.target()
-            except Exception as err:
+            except Exception:
                 log.fatal("Error in sub-process: %s", traceback.format_exc())
-                raise err
+                raise
         return result
 
 
+_POOL_TARGET = None
+"""The replicated function in a pool's worker process
+"""
+
+
+def _init_pool_target(target):
+    """Store the replicated function in a worker, so it is passed to each
+    worker once rather than with every replicate
+    """
+    global _POOL_TARGET  # pylint: disable=global-statement
+    _POOL_TARGET = target
+
+
+def _run_pool_target(context):
+    """Run the replicated function in a worker with the given context
+    """
+    return TargetCreator(_POOL_TARGET, context)()
+
+
 def _replicate_multiprocessing(function,
                                no_replicates,
                                no_processes,
@@ -73,22 +90,15 @@ def _replicate_multiprocessing(function,
     """Replicate the experiment defined by the function in multiple processes
     """
     with processing_state_context():
-        pool = multiprocessing.Pool(processes=no_processes)
-        manager = multiprocessing.Manager()
-        ready_queue = manager.Queue()  # pylint: disable=no-member
-        result_threads = []
+        pool = multiprocessing.Pool(processes=no_processes,
+                                    initializer=_init_pool_target,
+                                    initargs=(function,))
+        results = []
         for i in range(no_replicates):
-            # Create a target function to be run in  a separate process
-            # using a separate state context
-            target = TargetCreator(function, ready_queue, subkey_pattern % i)
-            result = pool.apply_async(target)
-            # Use a thread to wait for the result
-            waiter = threading.Thread(target=result.get)
-            waiter.start()
-            result_threads.append(waiter)
-            # Make sure the process is really running (probably not necessary)
-            while not ready_queue.get():
-                pass  # pragma: no cover
+            # Run the function in a separate process using a separate
+            # state context, only the context is sent with the task
+            results.append(pool.apply_async(_run_pool_target,
+                                            (subkey_pattern % i,)))
 
         # Wait for the pool, then join it
         log.debug("Closing pool")
@@ -96,10 +106,9 @@ def _replicate_multiprocessing(function,
         log.debug("Joining pool")
         pool.join()
 
-        # Make sure all the results are in
-        log.debug("Joining threads")
-        for thread in result_threads:
-            thread.join()
+        # Make sure all the results are in, raises errors from the replicates
+        for result in results:
+            result.get()
 
 
 def replicate(function,
@@ -131,7 +140,11 @@ def collect_results(key,
     """
     result = []
     no_replicates = no_replicates or int(conf['pyexperiment.n_replicates'])
+    # Keys starting with '__' are not in the substates
+    if key.startswith('__'):
+        return [state[key] for _ in range(no_replicates)]
     for i in range(no_replicates):
-        with substate_context(subkey_pattern % i):
-            result.append(state[key])
+        # Look up the key in the substate directly
+        result.append(
+            state[subkey_pattern % i + State.SECTION_SEPARATOR + key])
     return result
@@ -11,16 +11,19 @@ from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
 
+import os
 import multiprocessing
 import threading
+from collections import OrderedDict
 from contextlib import contextmanager
 import select
 
 from pyexperiment.State import State
 
 
-THREAD_LOCK = threading.Lock()
-"""Lock protecting the state
+THREAD_LOCK = threading.RLock()
+"""Lock protecting the state, reentrant because deleting sets the
+deleted marker
 """
 
 
@@ -38,14 +41,7 @@ def substate_context(substate_name):
         """
         if not key.startswith('__'):
             key = substate_name + State.SECTION_SEPARATOR + key
-        State.__setitem__ = original_setitem
-        try:
-            value = original_getitem(self, key)
-        except Exception as err:
-            raise err
-        finally:
-            State.__setitem__ = setsubitem
-        return value
+        return original_getitem(self, key)
 
     def setsubitem(self, key, value):
         """Set an item
@@ -73,8 +69,6 @@ def substate_context(substate_name):
 
     try:
         yield
-    except Exception as err:
-        raise err
     finally:
         State.__getitem__ = original_getitem
         State.__setitem__ = original_setitem
@@ -93,6 +87,10 @@ def thread_state_context():
     def save_getitem(self, key):
         """Get an item
         """
+        # Without lazy loading, reading does not modify the state, and
+        # the GIL makes the dict lookups atomic
+        if not self.lazy:
+            return original_getitem(self, key)
         with THREAD_LOCK:
             item = original_getitem(self, key)
         return item
@@ -107,17 +105,7 @@ def thread_state_context():
         """Delete an item
         """
         with THREAD_LOCK:
-            try:
-                State.__getitem__ = original_getitem
-                State.__setitem__ = original_setitem
-                State.__delitem__ = original_delitem
-                original_delitem(self, key)
-            except Exception as err:
-                raise err
-            finally:
-                State.__getitem__ = save_getitem
-                State.__setitem__ = save_setitem
-                State.__delitem__ = save_delitem
+            original_delitem(self, key)
 
     State.__getitem__ = save_getitem
     State.__setitem__ = save_setitem
@@ -125,8 +113,6 @@ def thread_state_context():
 
     try:
         yield
-    except Exception as err:
-        raise err
     finally:
         State.__getitem__ = original_getitem
         State.__setitem__ = original_setitem
@@ -137,111 +123,80 @@ def thread_state_context():
 def processing_state_context():
     """Locks the operations on the state for use with multiprocessing
     """
-    get_pipe = multiprocessing.Pipe()
-    set_pipe = multiprocessing.Pipe()
-    del_pipe = multiprocessing.Pipe()
+    # Requests from the processes share one pipe, tagged with an opcode
+    op_pipe = multiprocessing.Pipe()
     thread_pipe = multiprocessing.Pipe()
 
+    # Serializes the request/reply pairs of different processes
     mp_lock = multiprocessing.Lock()
+    main_pid = os.getpid()
 
     with thread_state_context():
         orig_get_set_del = (State.__getitem__,
                             State.__setitem__,
                             State.__delitem__)
 
-        def save_getitem(_self, key):
-            """Get an item
+        def request(*msg):
+            """Send a request to the main process and return the result
             """
             with mp_lock:
-                get_pipe[0].send(key)
-                item, err = get_pipe[0].recv()
+                op_pipe[0].send(msg)
+                item, err = op_pipe[0].recv()
             if err is not None:
                 raise err
             return item
 
-        def save_setitem(_self, key, value):
+        def save_getitem(self, key):
+            """Get an item
+            """
+            # The main process uses the state directly
+            if os.getpid() == main_pid:
+                return orig_get_set_del[0](self, key)
+            return request(b'G', key)
+
+        def save_setitem(self, key, value):
             """Set an item
             """
-            with mp_lock:
-                set_pipe[0].send((key, value))
-                err = set_pipe[0].recv()
-            if err is not None:
-                raise err
+            if os.getpid() == main_pid:
+                return orig_get_set_del[1](self, key, value)
+            request(b'S', key, value)
 
-        def save_delitem(_self, key):
+        def save_delitem(self, key):
             """Delete an item
             """
-            with mp_lock:
-                del_pipe[0].send((key))
-                err = del_pipe[0].recv()
-            if err is not None:
-                raise err
+            if os.getpid() == main_pid:
+                return orig_get_set_del[2](self, key)
+            request(b'D', key)
 
         def handler_thread():
             """Target for thread handling the state in the main process
             """
-            def handle_get():
-                """Handle getitem from process"""
-                key = get_pipe[1].recv()
-                try:
-                    item = orig_get_set_del[0](State.get_instance(), key)
-                except Exception as err:  # pylint: disable=broad-except
-                    # Raise the exception inside the process
-                    get_pipe[1].send((None, err))
-                else:
-                    get_pipe[1].send((item, None))
+            operations = {b'G': orig_get_set_del[0],
+                          b'S': orig_get_set_del[1],
+                          b'D': orig_get_set_del[2]}
 
-            def handle_set():
-                """Handle setitem from process
+            def handle_op():
+                """Handle getitem, setitem or delitem from process
                 """
-                key, value = set_pipe[1].recv()
+                msg = op_pipe[1].recv()
                 try:
-                    orig_get_set_del[1](State.get_instance(), key, value)
+                    item = operations[msg[0]](State.get_instance(), *msg[1:])
                 except Exception as err:  # pylint: disable=broad-except
                     # Raise the exception inside the process
-                    set_pipe[1].send(err)
-                    # raise err
+                    op_pipe[1].send((None, err))
                 else:
-                    set_pipe[1].send(None)
-
-            def handle_del():
-                """Handle delitem from process
-                """
-                key = del_pipe[1].recv()
-                try:
-                    State.__getitem__ = orig_get_set_del[0]
-                    State.__setitem__ = orig_get_set_del[1]
-                    State.__delitem__ = orig_get_set_del[2]
-                    orig_get_set_del[2](State.get_instance(), key)
-                except Exception as err:  # pylint: disable=broad-except
-                    # Raise the exception inside the process
-                    del_pipe[1].send(err)
-                    # raise err
-                else:
-                    del_pipe[1].send(None)
-                finally:
-                    State.__getitem__ = save_getitem
-                    State.__setitem__ = save_setitem
-                    State.__delitem__ = save_delitem
-
-            while True:
-                ins, _out, _err = select.select([get_pipe[1],
-                                                 set_pipe[1],
-                                                 del_pipe[1],
-                                                 thread_pipe[0]],
-                                                [],
-                                                [],
-                                                None)
-
-                if get_pipe[1] in ins:
-                    handle_get()
-                if set_pipe[1] in ins:
-                    handle_set()
-                if del_pipe[1] in ins:
-                    handle_del()
-                if thread_pipe[0] in ins:
-                    if thread_pipe[0].recv():
-                        break
+                    op_pipe[1].send((item, None))
+
+            # Handlers for the pipes, in the order they are served
+            handlers = OrderedDict(((op_pipe[1], handle_op),
+                                    (thread_pipe[0], thread_pipe[0].recv)))
+            pipes = list(handlers.keys())
+            stop = False
+            while not stop:
+                ins, _out, _err = select.select(pipes, [], [], None)
+                for pipe in ins:
+                    # Only the thread pipe's handler returns True
+                    stop = handlers[pipe]() or stop
 
         State.__getitem__ = save_getitem
         State.__setitem__ = save_setitem
@@ -252,15 +207,11 @@ def processing_state_context():
 
         try:
             yield
-        except Exception as err:
-            raise err
         finally:
-            pipes = [set_pipe[1], get_pipe[1]]
-            for pipe in pipes:
-                pipe.close()
             thread_pipe[1].send(True)
-            thread_pipe[1].close()
             thread.join()
+            for pipe in op_pipe + thread_pipe:
+                pipe.close()
             State.__getitem__ = orig_get_set_del[0]
             State.__setitem__ = orig_get_set_del[1]
             State.__delitem__ = orig_get_set_del[2]
@@ -16,11 +16,16 @@ from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
 
+import os
 import sys
 import multiprocessing
 import threading
 import traceback
 
+if True:  # Ugly, but makes pylint happy
+    # pylint:disable=import-error
+    from six.moves import queue
+
 
 class DelegateCall(object):  # pylint: disable=too-few-public-methods
     """Helper class that provides a multiprocessing-safe way to aggregate
@@ -30,45 +35,114 @@ class DelegateCall(object):  # pylint: disable=too-few-public-methods
     multiprocessing.Queue to the process where the class was
     initialized (i.e., all arguments must be serializable).
 
+    Calls that are waiting on the queue are processed in batches of up
+    to MAX_BATCH_SIZE. If a flush function is given, it is called after
+    each batch.
+
+    """
+    MAX_BATCH_SIZE = 128
+    """Maximal number of calls processed before flushing
+    """
+
+    _SENTINEL = None
+    """Put on the queue to stop the processing thread (None survives
+    pickling through the queue, and calls always send a tuple)
     """
-    def __init__(self, callback):
+
+    def __init__(self, callback, flush=None):
         """Initializer, takes a callback that processes the received data in
-        the original process.
+        the original process, and optionally a function called after each
+        batch of calls.
         """
         # The callback
         self.callback = callback
+        self.flush = flush
+
+        # Set by close, after which calls are made directly
+        self._closed = False
+        self._pid = os.getpid()
 
         # The queue that aggregates the data
         self._queue = multiprocessing.JoinableQueue(-1)
 
         # The thread that processes it
-        processor_thread = threading.Thread(target=self._receive)
-        processor_thread.daemon = True
-        processor_thread.start()
+        self._processor_thread = threading.Thread(target=self._receive)
+        self._processor_thread.daemon = True
+        self._processor_thread.start()
 
     def __call__(self, *data):
         """Send data, can be called from any process
         """
-        self._queue.put_nowait(data)
+        if self._closed:
+            # Nothing is left to process the queue
+            self._call(data)
+            self._flush()
+        else:
+            self._queue.put_nowait(data)
 
     def join(self):
-        """Returns true if there are currently no pending callbacks
+        """Blocks until there are no pending callbacks
+        """
+        if not self._closed:
+            self._queue.join()
+
+    def _call(self, data):
+        """Calls the callback with the data, reporting any exception
         """
-        return self._queue.join()
+        try:
+            self.callback(*data)
+        # This should really catch every other exception!
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc(file=sys.stderr)
+
+    def _flush(self):
+        """Calls the flush function if there is one, reporting any exception
+        """
+        if self.flush is None:
+            return
+        try:
+            self.flush()
+        # This should really catch every other exception!
+        except Exception:  # pylint: disable=broad-except
+            traceback.print_exc(file=sys.stderr)
+
+    def close(self):
+        """Stops the processing thread once the pending callbacks are
+        done. Calls after closing are made directly. Only has an effect in
+        the process that created the DelegateCall.
+        """
+        if self._closed or os.getpid() != self._pid:
+            return
+        self._closed = True
+        self._queue.put_nowait(self._SENTINEL)
+        self._processor_thread.join()
 
     def _receive(self):
-        """Loops indefinitely receiving calls from the queue
+        """Loops receiving calls from the queue until closed
         """
         while True:
             try:
-                data = self._queue.get()
-                self.callback(*data)
-                self._queue.task_done()
-            except EOFError:  # pragma: no cover
-                # This is covered, but not reported
+                batch = [self._queue.get()]
+            except (EOFError, OSError):  # pragma: no cover
+                # The queue is gone, e.g., at interpreter exit
                 break
-            # This should really catch every other exception!
-            except Exception:  # pylint: disable=broad-except
-                traceback.print_exc(file=sys.stderr)
-                # Should not get stuck here
+            # Process whatever else is already waiting in the same batch
+            while len(batch) < self.MAX_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            for data in batch:
+                if data is self._SENTINEL:
+                    stop = True
+                else:
+                    self._call(data)
+            self._flush()
+
+            # Only mark the calls done after flushing
+            for _ in batch:
                 self._queue.task_done()
+            if stop:
+                break
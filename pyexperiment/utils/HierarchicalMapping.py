@@ -61,6 +61,9 @@ class HierarchicalMapping(  # pylint: disable=too-many-ancestors
             split_name = key.split(self.SECTION_SEPARATOR)
         except AttributeError as err:
             raise TypeError("Key must be a string ('%s')" % err)
+        # Keys without separator are in the base level
+        if len(split_name) == 1:
+            return self.base, key
         level = 0
         section = self.base
         # Iterate through the sections
@@ -115,24 +118,29 @@ class HierarchicalMapping(  # pylint: disable=too-many-ancestors
             raise KeyError(
                 "Key does not exist '%s'" % key)
 
+    def _iter_items(self):
+        """Iterate over the keys and values of all entries in one walk
+        """
+        is_section = self._is_section
+
+        def walk(section, prefix):
+            """Walk a section depth-first
+            """
+            for key, value in iteritems(section):
+                if prefix:
+                    key = prefix + self.SECTION_SEPARATOR + key
+                if is_section(value):
+                    for item in walk(value, key):
+                        yield item
+                else:
+                    yield key, value
+
+        return walk(self.base or {}, '')
+
     def __iter__(self):
         """Need to define __iter__ to make it a MutableMapping
         """
-        iterator_list = [(iteritems(self.base or {}), '')]
-        while iterator_list:
-            iterator, prefix = iterator_list.pop()
-            try:
-                key, value = next(iterator)
-                if len(prefix) > 0:
-                    key = prefix + '.' + key
-            except StopIteration:
-                continue
-            iterator_list.append((iterator, prefix))
-
-            if self._is_section(value):
-                iterator_list.append((iteritems(value), key))
-            else:
-                yield key
+        return (key for key, _value in self._iter_items())
 
     def __len__(self):
         """Returns the number of entries in the mapping"""
@@ -200,8 +208,19 @@ class HierarchicalMapping(  # pylint: disable=too-many-ancestors
     def merge(self, other):
         """Merge in another mapping, giving precedence to self
         """
+        # Collect the existing keys and all sections, including empty ones
+        existing = set(self)
+        sections = [(self.base or {}, '')]
+        while sections:
+            section, prefix = sections.pop()
+            for key, value in iteritems(section):
+                if self._is_section(value):
+                    if prefix:
+                        key = prefix + self.SECTION_SEPARATOR + key
+                    existing.add(key)
+                    sections.append((value, key))
         for key, value in other.items():
-            if key not in self:
+            if key not in existing:
                 self[key] = value
 
 
@@ -219,7 +238,10 @@ class HierarchicalOrderedDict(  # pylint: disable=too-many-ancestors
     def _is_section(cls, obj):
         """Returns true if obj is a section
         """
-        return isinstance(obj, OrderedDict)
+        # Sections are created as plain OrderedDicts, checking the exact
+        # type is faster than isinstance for the leaves
+        # pylint: disable=unidiomatic-typecheck
+        return type(obj) is OrderedDict
 
     def __init__(self):
         """Initializer
@@ -242,7 +264,7 @@ class HierarchicalDict(  # pylint: disable=too-many-ancestors
     def _is_section(cls, obj):
         """Returns true if obj is a section
         """
-        return isinstance(obj, dict)
+        return type(obj) is dict  # pylint: disable=unidiomatic-typecheck
 
     def __init__(self):
         """Initializer
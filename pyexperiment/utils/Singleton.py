@@ -25,6 +25,50 @@ from __future__ import absolute_import
 
 import threading
 import inspect
+import operator
+
+_DELEGATE_CACHES = []
+"""The instances cached by the singleton delegates
+"""
+
+_DELEGATE_LOCK = threading.RLock()
+"""Lock ordering the delegates' caching with the resets
+"""
+
+_DELEGATES = {}
+"""The delegates created for each singleton class
+"""
+
+_NOT_DELEGATED = frozenset(['__class__',
+                            '__init__',
+                            '__dict__',
+                            '__new__',
+                            '__doc__',
+                            '__setattr__',
+                            '__abstractmethods__',
+                            '__delattr__',
+                            '__getattribute__',
+                            '__dir__'])
+"""Special methods the delegates do not pass on to the singleton
+"""
+
+_CONTAINER_OPERATORS = {'__getitem__': operator.getitem,
+                        '__setitem__': operator.setitem,
+                        '__delitem__': operator.delitem,
+                        '__contains__': operator.contains,
+                        '__len__': len,
+                        '__iter__': iter}
+"""Operators used for the container methods of the delegates, by special
+method
+"""
+
+
+def _clear_delegate_caches():
+    """Make the delegates look up the singleton instances again
+    """
+    with _DELEGATE_LOCK:
+        for cache in _DELEGATE_CACHES:
+            cache[0] = None
 
 
 class Singleton(object):
@@ -42,11 +86,13 @@ class Singleton(object):
     def get_instance(cls):
         """Get the singleton instance
         """
-        if cls.__singleton_instance is None:
+        instance = cls.__singleton_instance
+        if instance is None:
             with cls.__singleton_lock:
                 if cls.__singleton_instance is None:
                     cls.__singleton_instance = cls()
-        return cls.__singleton_instance
+                instance = cls.__singleton_instance
+        return instance
 
     @classmethod
     def reset_instance(cls):
@@ -56,6 +102,7 @@ class Singleton(object):
             with cls.__singleton_lock:
                 if cls.__singleton_instance is not None:
                     cls.__singleton_instance = None
+            _clear_delegate_caches()
 
 
 class DefaultSingleton(Singleton):
@@ -87,10 +134,11 @@ class DefaultSingleton(Singleton):
         """Get the singleton instance if its initialized.
         Returns, the pseudo instance if not.
         """
-        if cls.__singleton_instance is None:
+        instance = cls.__singleton_instance
+        if instance is None:
             return cls._get_pseudo_instance()
         else:
-            return cls.__singleton_instance
+            return instance
 
     @classmethod
     def reset_instance(cls):
@@ -100,6 +148,7 @@ class DefaultSingleton(Singleton):
             with cls.__singleton_lock:
                 if cls.__singleton_instance is not None:
                     cls.__singleton_instance = None
+            _clear_delegate_caches()
 
     @classmethod
     def initialize(cls, *args, **kwargs):
@@ -107,40 +156,74 @@ class DefaultSingleton(Singleton):
         After calling this function, the real instance will be used.
         """
         cls.__singleton_instance = cls(*args, **kwargs)
+        _clear_delegate_caches()
 
 
-def delegate_special_methods(singleton):
-    """Decorator that delegates special methods to a singleton
+def delegate_special_methods(singleton, cache=(None,), get_instance=None):
+    """Decorator that delegates special methods to a singleton, using the
+    instance in the cache if it is set
     """
-    def _create_delegate(name, singleton):
+    get_instance = get_instance or singleton.get_instance
+
+    def _create_container_delegate(name):
+        """Creates a thunk for the container methods, without packing the
+        arguments
+        """
+        item_operator = _CONTAINER_OPERATORS[name]
+        if name in ('__len__', '__iter__'):
+            def f(_self):
+                """Applies the operator to the singleton
+                """
+                instance = cache[0]
+                if instance is None:
+                    instance = get_instance()
+                return item_operator(instance)
+        elif name == '__setitem__':
+            def f(_self, key, value):
+                """Sets the item on the singleton
+                """
+                instance = cache[0]
+                if instance is None:
+                    instance = get_instance()
+                item_operator(instance, key, value)
+        else:
+            def f(_self, key):
+                """Applies the item operator to the singleton
+                """
+                instance = cache[0]
+                if instance is None:
+                    instance = get_instance()
+                return item_operator(instance, key)
+        return f
+
+    def _create_delegate(name):
         """Creates a thunk that calls the attribute on the singleton
         """
-        def f(*args, **kwargs):
+        if name in _CONTAINER_OPERATORS:
+            return _create_container_delegate(name)
+
+        def f(_self, *args, **kwargs):
             """Calls the attribute on the singleton
             """
-            ret = getattr(singleton.get_instance(),
-                          name)(*args[1:], **kwargs)
-            return ret
+            instance = cache[0]
+            if instance is None:
+                instance = get_instance()
+            return getattr(instance, name)(*args, **kwargs)
         return f
 
     def decorator(cls):
         """The decorator to be returned
         """
-        for name, _attr in inspect.getmembers(singleton):
+        # The names in the classes' dicts, without resolving the attributes
+        names = set(name
+                    for klass in inspect.getmro(singleton)
+                    for name in vars(klass))
+        for name in names:
             if (name[:2], name[-2:]) != ('__', '__'):
                 continue
-            if name in ['__class__',
-                        '__init__',
-                        '__dict__',
-                        '__new__',
-                        '__doc__',
-                        '__setattr__',
-                        '__abstractmethods__',
-                        '__delattr__',
-                        '__getattribute__',
-                        '__dir__']:
+            if name in _NOT_DELEGATED:
                 continue
-            setattr(cls, name, _create_delegate(name, singleton))
+            setattr(cls, name, _create_delegate(name))
         return cls
     return decorator
 
@@ -148,15 +231,45 @@ def delegate_special_methods(singleton):
 def delegate_singleton(singleton):
     """Creates an object that delegates all calls to the singleton
     """
+    with _DELEGATE_LOCK:
+        if singleton not in _DELEGATES:
+            _DELEGATES[singleton] = _create_singleton_delegate(singleton)
+        return _DELEGATES[singleton]
+
+
+def _create_singleton_delegate(singleton):
+    """Creates the delegate for delegate_singleton
+    """
+    cache = [None]
+    _DELEGATE_CACHES.append(cache)
+
+    def get_instance():
+        """Get the singleton's instance, cached until it is reset
+        """
+        with _DELEGATE_LOCK:
+            instance = singleton.get_instance()
+            # Pseudo instances are not cached
+            if isinstance(instance, singleton):
+                cache[0] = instance
+        return instance
+
     # pylint: disable=too-few-public-methods
-    @delegate_special_methods(singleton)
+    @delegate_special_methods(singleton, cache, get_instance)
     class SingletonDelegate(object):
         """Passes attribute access to the singleton's instance
         """
-        def __getattr__(self, attr):
-            """Call __getattr__ on the singleton instance
+        __slots__ = []
+
+        def __getattribute__(self, attr):
+            """Get the attribute from the singleton instance, unless the
+            delegate defines it itself
             """
-            return getattr(singleton.get_instance(), attr)
+            if attr in own_attributes:
+                return object.__getattribute__(self, attr)
+            instance = cache[0]
+            if instance is None:
+                instance = get_instance()
+            return getattr(instance, attr)
 
         @staticmethod
         def __dir__():
@@ -170,4 +283,6 @@ def delegate_singleton(singleton):
             """
             singleton.initialize(*args, **kwargs)
 
+    # Attributes the delegate looks up on itself
+    own_attributes = frozenset(dir(SingletonDelegate))
     return SingletonDelegate()
@@ -7,14 +7,18 @@ from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
 
-import six
 import configobj
-from collections import defaultdict
-from itertools import count as count_up
-from toolz import remove
 
 from pyexperiment.utils.HierarchicalMapping import HierarchicalOrderedDict
 
+SPEC_TYPES = dict([(type(3), "integer"),
+                   (type("bla"), "string"),
+                   (type(True), "boolean"),
+                   (type(3.14), "float"),
+                   (tuple, "tuple")])
+"""Types of the config spec entries by the type of their default values
+"""
+
 
 def convert_spec(spec):
     """Convert spec (string or filename) to ConfigObj
@@ -33,31 +37,36 @@ def conf_to_ohm(conf, ohm=None, section_name=''):
     if ohm is None:
         ohm = HierarchicalOrderedDict()
 
-    for key, value in conf.items():
-        if not section_name == '':
-            new_key = (section_name +
-                       HierarchicalOrderedDict.SECTION_SEPARATOR +
-                       key)
-        else:
-            new_key = key
-        if not isinstance(value, configobj.Section):
+    separator = HierarchicalOrderedDict.SECTION_SEPARATOR
+    # Walk the sections depth-first, keeping the order of the entries
+    stack = [(iter(conf.items()), section_name)]
+    while stack:
+        items, prefix = stack[-1]
+        for key, value in items:
+            new_key = prefix + separator + key if prefix else key
+            if isinstance(value, configobj.Section):
+                stack.append((iter(value.items()), new_key))
+                break
             ohm[new_key] = value
         else:
-            conf_to_ohm(value,
-                        ohm=ohm,
-                        section_name=new_key)
+            stack.pop()
     return ohm
 
 
 def sort_ohm(ohm):
     """Sorts an OrderedHierarchicalMapping
     """
-    first_level = lambda k: len(k[0].split(ohm.SECTION_SEPARATOR)) == 1
-    leveled_items = remove(first_level, ohm.items())
-    first_level_items = [item for item in ohm.items() if first_level(item)]
-    return first_level_items + sorted(leveled_items,
-                                      key=lambda k: k[0].split(
-                                          ohm.SECTION_SEPARATOR))
+    first_level_items = []
+    leveled_items = []
+    separator = ohm.SECTION_SEPARATOR
+    for key, value in ohm.items():
+        if separator not in key:
+            first_level_items.append((key, value))
+        else:
+            leveled_items.append((key.split(separator), key, value))
+    leveled_items.sort(key=lambda item: item[0])
+    return first_level_items + [(key, value)
+                                for _split_key, key, value in leveled_items]
 
 
 def ohm_to_spec_list(ohm, value_transform=lambda x: x):
@@ -66,62 +75,53 @@ def ohm_to_spec_list(ohm, value_transform=lambda x: x):
     The value_transform argument should be a function that transforms
     the values of the ohm to the entries of the spec list.
     """
-    spec = []
     level_start = "["
     level_stop = "]"
+    # Entries and subsections of each section, by the path of the section
+    sections = {(): ([], [])}
 
-    sorted_items = sort_ohm(ohm)
-
-    def skip_to_header(spec, section_header):
-        """Skips to the next header"""
-        index = spec.index(section_header)
-        for elem in spec[index:]:
-            if not elem[0] == six.b('[')[0]:
-                continue
-            else:
-                index += 1
-        return index
-
-    for key, value in sorted_items:
+    for key, value in sort_ohm(ohm):
         split_key = key.split(ohm.SECTION_SEPARATOR)
-        index = None
-        if len(split_key) > 1:
-            for level, part in zip(count_up(1), split_key[:-1]):
-                section_header = (level * level_start +
-                                  part +
-                                  level*level_stop).encode()
-                if section_header in spec:
-                    index = skip_to_header(spec, section_header)
-                    continue
-                else:
-                    spec += [section_header]
-                    index = skip_to_header(spec, section_header)
+        path = ()
+        for part in split_key[:-1]:
+            subpath = path + (part,)
+            if subpath not in sections:
+                sections[subpath] = ([], [])
+                sections[path][1].append(subpath)
+            path = subpath
 
         spec_entry = (split_key[-1] +
                       " = " +
                       value_transform(value))
-        if index is None:
-            spec += [spec_entry.encode()]
-        else:
-            spec.insert(index + 1, spec_entry.encode())
+        sections[path][0].append(spec_entry.encode())
+
+    spec = []
+
+    def add_section(path):
+        """Adds the entries of a section, followed by its subsections"""
+        entries, subsections = sections[path]
+        spec.extend(entries)
+        for subpath in subsections:
+            level = len(subpath)
+            spec.append((level * level_start +
+                         subpath[-1] +
+                         level * level_stop).encode())
+            add_section(subpath)
+
+    add_section(())
     return spec
 
 
+def spec_value(value):
+    """Transforms a value to its entry in a config spec
+    """
+    spec_type = SPEC_TYPES.get(type(value), "string")
+    if isinstance(value, (tuple, list)):
+        return "%s(default=list%s)" % (spec_type, str(tuple(value)))
+    return "%s(default=%s)" % (spec_type, value)
+
+
 def ohm_to_spec(ohm):
     """Creates a config spec from an OrderedHierarchicalMapping
     """
-    spec_type = defaultdict(lambda: "string",
-                            [(type(3), "integer"),
-                             (type("bla"), "string"),
-                             (type(True), "boolean"),
-                             (type(3.14), "float"),
-                             (tuple, "tuple")])
-
-    value_transform = lambda value: (spec_type[type(value)] +
-                                     ("(default=%s)" % value
-                                      if not (isinstance(value, tuple) or
-                                              isinstance(value, list))
-                                      else "(default=list%s)" % str(
-                                          tuple(value))))
-
-    return ohm_to_spec_list(ohm, value_transform)
+    return ohm_to_spec_list(ohm, spec_value)
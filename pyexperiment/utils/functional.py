@@ -13,11 +13,9 @@ from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
 
-from pyexperiment.utils import sentinel
+from itertools import chain
 
-if True:  # Ugly, but makes pylint happy
-    # pylint:disable=import-error
-    from six.moves import zip_longest
+from pyexperiment.utils import sentinel
 
 
 NONE = sentinel.create('NONE', 'Nothing')
@@ -28,29 +26,31 @@ NONE = sentinel.create('NONE', 'Nothing')
 def shorter(iter1, iter2):
     """Returns True if iterator 1 is shorter than iterator 2
     """
-    for item1, item2 in zip_longest(iter1, iter2, fillvalue=NONE):
-        if item2 is not NONE:
-            if item1 is NONE:
-                return True
-        else:
+    iter1, iter2 = iter(iter1), iter(iter2)
+    while True:
+        item1 = next(iter1, NONE)
+        if next(iter2, NONE) is NONE:
             return False
+        if item1 is NONE:
+            return True
 
 
 def starts_with(iter1, iter2):
     """True if the first iterator starts with the elements of the second
     """
-    equal_so_far = True
-    for item1, item2 in zip_longest(iter1, iter2, fillvalue=NONE):
-        if item2 is not NONE:
-            if item1 is not NONE:
-                equal_so_far = equal_so_far and item1 == item2
-            else:
-                return equal_so_far
-        else:
+    iter1, iter2 = iter(iter1), iter(iter2)
+    while True:
+        item1 = next(iter1, NONE)
+        item2 = next(iter2, NONE)
+        if item2 is NONE:
+            return False
+        if item1 is NONE:
+            return True
+        if not item1 == item2:
             return False
 
 
 def flatten(seq):
     """Flatten nested sequence
     """
-    return (item for sublist in seq for item in sublist)
+    return chain.from_iterable(seq)
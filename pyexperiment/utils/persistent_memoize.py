@@ -10,11 +10,15 @@ from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
 
-from toolz import memoize
+import inspect
+from functools import wraps
 from inspect import getsource
 
 from pyexperiment import state
 
+# Python 2 compatibility
+GETARGSPEC = getattr(inspect, 'getfullargspec', None) or inspect.getargspec
+
 
 class PersistentCache(object):  # pylint: disable=too-few-public-methods
     """Persistent cache object that redirects to the state
@@ -23,6 +27,8 @@ class PersistentCache(object):  # pylint: disable=too-few-public-methods
     """Prefix for the keys of the persistent cache in the state
     """
 
+    __slots__ = ['key']
+
     def __init__(self, key):
         """Initializer
         """
@@ -47,10 +53,67 @@ class PersistentCache(object):  # pylint: disable=too-few-public-methods
         return state[self.key].__iter__()
 
 
+def _get_cache_key(target):
+    """Get the function mapping the arguments to the key in the cache,
+    or None if the function's only argument is the key
+
+    The keys are the ones toolz' memoize uses, so that caches saved in
+    states before remain valid.
+    """
+    try:
+        spec = GETARGSPEC(target)
+    except TypeError:
+        spec = None
+
+    if spec is None:
+        may_have_kwargs, is_unary = True, False
+    else:
+        may_have_kwargs = bool(getattr(spec, 'varkw', None) or
+                               getattr(spec, 'keywords', None) or
+                               getattr(spec, 'kwonlyargs', None) or
+                               spec.defaults)
+        is_unary = (spec.varargs is None and not may_have_kwargs
+                    and len(spec.args) == 1)
+
+    if is_unary:
+        return None
+    elif may_have_kwargs:
+        return lambda args, kwargs: (
+            args or None,
+            frozenset(kwargs.items()) if kwargs else None)
+    else:
+        return lambda args, _kwargs: args
+
+
 def persistent_memoize(target):
     """Memoize target function, keep persistent cache in state
     """
     target_hash = hash(getsource(target))
     cache = PersistentCache(target_hash)
+    get_key = _get_cache_key(target)
+
+    if get_key is None:
+        @wraps(target)
+        def memoized_unary(arg):
+            """Look up the result in the cache, call target if it is missing
+            """
+            try:
+                return cache[arg]
+            except KeyError:
+                cache[arg] = result = target(arg)
+                return result
+
+        return memoized_unary
+
+    @wraps(target)
+    def memoized(*args, **kwargs):
+        """Look up the result in the cache, call target if it is missing
+        """
+        key = get_key(args, kwargs)
+        try:
+            return cache[key]
+        except KeyError:
+            cache[key] = result = target(*args, **kwargs)
+            return result
 
-    return memoize(target, cache=cache)
+    return memoized
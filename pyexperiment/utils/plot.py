@@ -27,6 +27,10 @@ from matplotlib import pyplot as plt
 
 from multiprocessing import Process, Queue
 
+if True:  # Ugly, but makes pylint happy
+    # pylint:disable=import-error
+    from six.moves import queue as queue_module
+
 from pyexperiment import conf
 from pyexperiment import log
 
@@ -67,19 +71,22 @@ def setup_plotting(options=None,
         return False
 
     font_size = int(option_or_conf('font_size', 14))
-    font = {'family': 'normal',
-            'weight': 'normal',
-            'size': font_size}
-
-    matplotlib.rc('font', **font)
-
-    matplotlib.rc('text', usetex=bool(option_or_conf('use_tex', True)))
-    matplotlib.rc('lines', linewidth=int(option_or_conf('line_width', 4)))
-    matplotlib.rc('figure', facecolor='white')
-
     label_size = int(option_or_conf('label_size', 14))
-    matplotlib.rc('xtick', labelsize=label_size)
-    matplotlib.rc('ytick', labelsize=label_size)
+    params = {'font.family': ['normal'],
+              'font.weight': 'normal',
+              'font.size': font_size,
+              'text.usetex': bool(option_or_conf('use_tex', True)),
+              'lines.linewidth': int(option_or_conf('line_width', 4)),
+              'figure.facecolor': 'white',
+              'xtick.labelsize': label_size,
+              'ytick.labelsize': label_size}
+
+    # Changing the parameters resets matplotlib's caches, skip the ones
+    # that are already set
+    changed_params = dict((key, value) for key, value in params.items()
+                          if matplotlib.rcParams[key] != value)
+    if changed_params:
+        matplotlib.rcParams.update(changed_params)
 
     if sns is not None:
         sns.set_style(option_or_conf('seaborn.style', 'darkgrid'))
@@ -142,8 +149,11 @@ class AsyncPlot(object):
         while True:
             # Get all the data currently on the queue
             data = []
-            while not queue.empty():
-                data.append(queue.get())
+            while True:
+                try:
+                    data.append(queue.get_nowait())
+                except queue_module.Empty:
+                    break
 
             # If there is no data, no need to plot, instead wait for a
             # while
@@ -38,17 +38,18 @@ def colorize(string, color_s):
     return color_s + string + RESET_SEQ
 
 
-def _print_color(color, string, *args):
-    """Prints string in color to stdout
-    """
-    print(colorize(string % args, color))
-
-
 for color_name, color_seq in COLORS.items():
     def create_printer(color):
         """Creates the printer for the corresponding color
         """
-        return lambda string, *args: _print_color(color, string, *args)
+        def printer(string, *args):
+            """Prints string in color to stdout, interpolating the
+            arguments if there are any (as logging does)
+            """
+            if args:
+                string = string % args
+            print(color + string + RESET_SEQ)
+        return printer
 
     vars()['print_' + color_name] = create_printer(color_seq)
 
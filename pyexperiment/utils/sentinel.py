@@ -11,7 +11,7 @@ from __future__ import unicode_literals
 from __future__ import division
 from __future__ import absolute_import
 
-import inspect
+import sys
 
 
 def create(name, description=''):
@@ -19,39 +19,42 @@ def create(name, description=''):
     """
     if description == '':
         description = "Sentinel '%s'" % name
+    # Make Sentinel belong to the module where it is created
+    # pylint: disable=protected-access
+    module_name = sys._getframe(1).f_globals['__name__']
 
-    class Sentinel(object):  # pylint: disable=too-few-public-methods
-        """Sentinel class
+    def __init__(self):
+        """Initializer
         """
-        def __init__(self):
-            """Initializer
-            """
-            self.name = str(name)
-            self.__name__ = self.name
-            self.__class__.__name__ = self.name
-            # Allow no instances
-            self.__slots__ = ()
-
-            # Make Sentinel belong to the module where it is created
-            self.__class__.__module__ = inspect.stack(
-                )[2][0].f_globals['__name__']
-
-        def __repr__(self):
-            """Represent the sentinel"""
-            return description
-
-        def __copy__(self):
-            """Copy the sentinel returns itself
-            """
-            return self
-
-        def __deepcopy__(self, _):
-            """Copy the sentinel returns itself
-            """
-            return self
+        self.name = str(name)
+        self.__name__ = self.name
+
+    def __repr__(_self):
+        """Represent the sentinel"""
+        return description
+
+    def __copy__(self):
+        """Copy the sentinel returns itself
+        """
+        return self
+
+    def __deepcopy__(self, _):
+        """Copy the sentinel returns itself
+        """
+        return self
+
+    # Create the class with its final name and module in one go
+    sentinel_class = type(str(name), (object,), {
+        '__doc__': "Sentinel class",
+        '__module__': module_name,
+        '__slots__': ['name', '__name__'],
+        '__init__': __init__,
+        '__repr__': __repr__,
+        '__copy__': __copy__,
+        '__deepcopy__': __deepcopy__})
 
     # Create an instance, then make sure no one else can instantiate
-    sentinel = Sentinel()
+    sentinel = sentinel_class()
 
-    del Sentinel
+    del sentinel_class
     return sentinel
@@ -13,6 +13,20 @@ import os
 
 from pyexperiment import conf
 
+SPEC_A = (b"[section_1]",
+          b"a = integer(min=0, default=5)")
+SPEC_A_MAX7 = (b"[section_1]",
+               b"a = integer(min=0, default=5, max=7)")
+SPEC_A_MAX12 = (b"[section_1]",
+                b"a = integer(min=0, default=5, max=12)")
+SPEC_A_MAX13 = (b"[section_1]",
+                b"a = integer(min=0, default=5, max=13)")
+SPEC_D_MAX12 = (b"[section_1]",
+                b"d = integer(min=0, default=5, max=12)")
+SPEC_NESTED = (b"[section_1]",
+               b"[[section_a]]",
+               b"a = integer(min=0, default=5)")
+
 
 class TestConf(unittest.TestCase):
     """Test the conf module's basic functions
@@ -125,18 +139,32 @@ class TestConfFile(unittest.TestCase):
                    "[section_2]\n"
                    "c = True")
 
-    def setUp(self):
-        """Setup the test fixture
+    @classmethod
+    def setUpClass(cls):
+        """Write the configuration file shared by the tests
+        """
+        handle, cls.filename = tempfile.mkstemp()
+        os.write(handle, cls.TEST_CONFIG.encode())
+        os.close(handle)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared configuration file
         """
-        self.filename = tempfile.mkstemp()[1]
-        with open(self.filename, 'w') as outfile:
-            outfile.write(self.TEST_CONFIG)
+        os.remove(cls.filename)
 
     def tearDown(self):
         """Tear down the test fixture
         """
         conf.reset_instance()
-        os.remove(self.filename)
+
+    def _mktemp(self):
+        """Returns the name of a temporary file removed after the test
+        """
+        handle, filename = tempfile.mkstemp()
+        os.close(handle)
+        self.addCleanup(os.remove, filename)
+        return filename
 
     def test_initialize_with_file(self):
         """Test initializing uninitialized config with a file
@@ -166,7 +194,7 @@ class TestConfFile(unittest.TestCase):
         """
         conf.load(self.filename)
 
-        filename = tempfile.mkstemp()[1]
+        filename = self._mktemp()
         conf.save(filename)
 
         # Destroy configuration
@@ -183,8 +211,6 @@ class TestConfFile(unittest.TestCase):
         self.assertEqual(c_conf, 'True')
 
         self.assertTrue(os.path.isfile(filename))
-        # Clean up
-        os.remove(filename)
 
     def test_len(self):
         """Test the length of the config is reported correctly
@@ -256,12 +282,7 @@ class TestConfFile(unittest.TestCase):
     def test_override_with_args_spec(self):
         """Test adding config options with a spec
         """
-        spec = ("[section_1]\n"
-                "a = integer(min=0, default=5, max=13)")
-
-        conf.load(self.filename,
-                  spec=(
-                      [option.encode() for option in spec.split('\n')]))
+        conf.load(self.filename, spec=SPEC_A_MAX13)
         conf.override_with_args([('section_1.a', '13')])
         self.assertEqual(conf['section_1.a'], '13')
         conf.validate_config(conf.base)
@@ -270,15 +291,11 @@ class TestConfFile(unittest.TestCase):
     def test_override_with_args_wrong(self):
         """Test adding config options with a wrong spec
         """
-        spec = ("[section_1]\n"
-                "a = integer(min=0, default=5, max=12)")
         expected_error = (
             r"Configuration does not adhere to the specification: "
             r"\[\(\['section_1'\], 'a', "
             r"VdtValueTooBigError\('the value \"13\" is too big.',\)\)\]")
-        conf.load(self.filename,
-                  spec=(
-                      [option.encode() for option in spec.split('\n')]))
+        conf.load(self.filename, spec=SPEC_A_MAX12)
         conf.override_with_args([('section_1.a', '13')])
         self.assertRaisesRegexp(
             ValueError,
@@ -296,27 +313,29 @@ class TestConfSpec(unittest.TestCase):
                    "[section_2]\n"
                    "c = True")
 
-    def setUp(self):
-        """Setup the test fixture
+    @classmethod
+    def setUpClass(cls):
+        """Write the configuration file shared by the tests
         """
-        self.filename = tempfile.mkstemp()[1]
-        with open(self.filename, 'w') as outfile:
-            outfile.write(self.TEST_CONFIG)
+        handle, cls.filename = tempfile.mkstemp()
+        os.write(handle, cls.TEST_CONFIG.encode())
+        os.close(handle)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared configuration file
+        """
+        os.remove(cls.filename)
 
     def tearDown(self):
         """Tear down the test fixture
         """
         conf.reset_instance()
-        os.remove(self.filename)
 
     def test_load_with_spec(self):
         """Test loading a configuration with a specification
         """
-        spec = ("[section_1]\n"
-                "a = integer(min=0, default=5)")
-        conf.load(self.filename,
-                  spec=(
-                      [option.encode() for option in spec.split('\n')]))
+        conf.load(self.filename, spec=SPEC_A)
         self.assertTrue('section_1.a' in conf)
         self.assertIsInstance(conf['section_1.a'], int)
         self.assertEqual(conf['section_1.a'], 12)
@@ -324,12 +343,7 @@ class TestConfSpec(unittest.TestCase):
     def test_load_with_nested_spec(self):
         """Test loading a configuration with a nested specification
         """
-        spec = ("[section_1]\n"
-                "[[section_a]]\n"
-                "a = integer(min=0, default=5)")
-        conf.load(self.filename,
-                  spec=(
-                      [option.encode() for option in spec.split('\n')]))
+        conf.load(self.filename, spec=SPEC_NESTED)
         self.assertTrue('section_1.section_a.a' in conf)
         self.assertIsInstance(conf['section_1.section_a.a'], int)
         self.assertEqual(conf['section_1.section_a.a'], 5)
@@ -341,8 +355,6 @@ class TestConfSpec(unittest.TestCase):
     def test_load_with_wrong_spec(self):
         """Test loading a configuration that does not adhere to the specs
         """
-        spec = ("[section_1]\n"
-                "a = integer(min=0, default=5, max=7)")
         expected_error = (
             r"Configuration does not adhere to the specification: "
             r"\[\(\['section_1'\], 'a', "
@@ -351,32 +363,23 @@ class TestConfSpec(unittest.TestCase):
         self.assertRaisesRegexp(
             ValueError,
             expected_error,
-            conf.load, self.filename, spec=(
-                [option.encode() for option in spec.split('\n')]))
+            conf.load, self.filename, spec=SPEC_A_MAX7)
 
     def test_initialize_with_spec(self):
         """Test initializing uninitialized config with a spec
         """
-        spec = ("[section_1]\n"
-                "d = integer(min=0, default=5, max=12)")
-
         conf['section_1.d'] = 13
         self.assertEqual(conf['section_1.d'], 13)
-        conf.initialize(self.filename, spec=(
-            [option.encode() for option in spec.split('\n')]))
+        conf.initialize(self.filename, spec=SPEC_D_MAX12)
 
         self.assertEqual(conf['section_1.d'], 5)
 
     def test_initialize_with_new_spec(self):
         """Test initializing uninitialized config with a new spec
         """
-        spec = ("[section_1]\n"
-                "d = integer(min=0, default=5, max=12)")
-
         conf['bla'] = 13
         self.assertEqual(conf['bla'], 13)
-        conf.initialize(self.filename, spec=(
-            [option.encode() for option in spec.split('\n')]))
+        conf.initialize(self.filename, spec=SPEC_D_MAX12)
 
         self.assertEqual(conf['section_1.d'], 5)
         self.assertEqual(conf['bla'], 13)
@@ -384,15 +387,11 @@ class TestConfSpec(unittest.TestCase):
     def test_initialize_with_level_spec(self):
         """Test initializing uninitialized config with a new spec
         """
-        spec = ("[section_1]\n"
-                "d = integer(min=0, default=5, max=12)")
-
         conf['bli.bla'] = 12
         conf['bla'] = 13
         self.assertEqual(conf['bli.bla'], 12)
         self.assertEqual(conf['bla'], 13)
-        conf.initialize(self.filename, spec=(
-            [option.encode() for option in spec.split('\n')]))
+        conf.initialize(self.filename, spec=SPEC_D_MAX12)
 
         self.assertEqual(conf['section_1.d'], 5)
         self.assertEqual(conf['bli.bla'], 12)
@@ -401,13 +400,9 @@ class TestConfSpec(unittest.TestCase):
     def test_initialize_with_file_spec(self):
         """Test initializing uninitialized config with a file and spec
         """
-        spec = ("[section_1]\n"
-                "a = integer(min=0, default=5, max=12)")
-
         conf['section_1.a'] = 13
         self.assertEqual(conf['section_1.a'], 13)
-        conf.initialize(self.filename, spec=(
-            [option.encode() for option in spec.split('\n')]))
+        conf.initialize(self.filename, spec=SPEC_A_MAX12)
 
         self.assertEqual(conf['section_1.a'], 12)
 
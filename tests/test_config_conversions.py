@@ -107,5 +107,24 @@ class TestOhmToSpec(unittest.TestCase):
              "[[c]]",
              "d = integer(default=3)"])
 
+    def test_level2_spec_mixed(self):
+        """Test entries of a section are not moved to its subsections
+        """
+        default = HierarchicalOrderedDict()
+        default['a.x'] = 1
+        default['a.b.y'] = 2
+        default['a.z'] = 3
+        default['c.b.w'] = 4
+        self.assert_equal_encoded_list(
+            ohm_to_spec(default),
+            ["[a]",
+             "x = integer(default=1)",
+             "z = integer(default=3)",
+             "[[b]]",
+             "y = integer(default=2)",
+             "[c]",
+             "[[b]]",
+             "w = integer(default=4)"])
+
 if __name__ == '__main__':
     unittest.main()
@@ -82,6 +82,63 @@ class TestDelegateCall(unittest.TestCase):
         self.assertEqual(called[0], 1)
         self.assertEqual(called_from[0], os.getpid())
 
+    def test_delegating_with_flush(self):
+        """Test the flush function is called after the calls are processed
+        """
+        called = []
+
+        def target(value):
+            """Target function"""
+            called.append(value)
+
+        def flush():
+            """Flush function"""
+            called.append('flush')
+
+        delegated = DelegateCall(target, flush)
+        for i in range(10):
+            delegated(i)
+        delegated.join()
+        self.assertEqual([value for value in called if value != 'flush'],
+                         list(range(10)))
+        self.assertEqual(called[-1], 'flush')
+
+    def test_close_stops_thread(self):
+        """Test closing the DelegateCall after the pending calls are done
+        """
+        called = [0]
+
+        def target():
+            """Target function"""
+            called[0] += 1
+
+        delegated = DelegateCall(target)
+        delegated()
+        delegated.join()
+        delegated.close()
+        self.assertEqual(called[0], 1)
+        # pylint: disable=protected-access
+        delegated._processor_thread.join(1.0)
+        self.assertFalse(delegated._processor_thread.is_alive())
+
+    def test_call_after_close(self):
+        """Test calling and closing again after closing does not block
+        """
+        called = [0]
+
+        def target():
+            """Target function"""
+            called[0] += 1
+
+        delegated = DelegateCall(target)
+        delegated.close()
+        delegated()
+        delegated.join()
+        delegated.close()
+        delegated.close()
+        delegated.join()
+        self.assertEqual(called[0], 1)
+
 
 if __name__ == '__main__':
     unittest.main()
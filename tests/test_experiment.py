@@ -15,6 +15,7 @@ import mock
 import tempfile
 import logging
 import multiprocessing
+import functools
 
 from pyexperiment import experiment
 from pyexperiment.utils.stdout_redirector import stdout_redirector
@@ -151,6 +152,26 @@ class TestExperimentBasic(unittest.TestCase):
             experiment.main,
             default=custom_function)
 
+    def test_main_runs_partial_default(self):
+        """Test running main with a partially applied default command
+        """
+        # Monkey patch arg parser here
+        argparse._sys.argv = [  # pylint: disable=W0212
+            "test"]
+
+        run = [False]
+
+        def custom_function(value):
+            """User function
+            """
+            run[0] = value
+
+        buf = io.StringIO()
+        with stdout_redirector(buf):
+            experiment.main(default=functools.partial(custom_function, True))
+
+        self.assertTrue(run[0])
+
     def test_main_runs_other_function(self):
         """Test running main with default command and other function
         """
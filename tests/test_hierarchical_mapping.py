@@ -9,7 +9,7 @@ from __future__ import division
 from __future__ import absolute_import
 
 import unittest
-
+from collections import OrderedDict
 
 from pyexperiment.utils.HierarchicalMapping import HierarchicalMapping
 from pyexperiment.utils.HierarchicalMapping import HierarchicalOrderedDict
@@ -256,6 +256,27 @@ class TestHierarchicalOrderedDict(unittest.TestCase):
             if key not in [item[0] for item in items]:
                 self.hod[key] = value
 
+    def test_merge_keeps_own_values(self):
+        """Test merging gives precedence to the values and sections of self
+        """
+        self.hod['a'] = 12
+        self.hod['c.d'] = 14
+        self.hod['f'] = OrderedDict()
+
+        m_2 = HierarchicalOrderedDict()
+        m_2['a'] = 1
+        m_2['c.e'] = 3
+        self.hod.merge(m_2)
+        m_3 = HierarchicalOrderedDict()
+        m_3['c'] = 2
+        m_3['f'] = 4
+        self.hod.merge(m_3)
+
+        self.assertEqual(self.hod['a'], 12)
+        self.assertEqual(self.hod['c.d'], 14)
+        self.assertEqual(self.hod['c.e'], 3)
+        self.assertEqual(self.hod['f'], OrderedDict())
+
     def test_section_keys(self):
         """Test the section_keys method on the mapping
         """
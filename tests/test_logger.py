@@ -15,6 +15,9 @@ import tempfile
 import os
 import time
 import re
+import multiprocessing
+import numpy as np
+import mock
 
 from pyexperiment import log
 from pyexperiment import Logger
@@ -96,6 +99,40 @@ class TestLogger(unittest.TestCase):
         # Something should be logged here
         self.assertNotEqual(len(self.log_stream.getvalue()), 0)
 
+    def test_formatter_restores_record(self):
+        """Test formatting a record leaves the record unchanged
+        """
+        for use_color in [True, False]:
+            formatter = Logger.ColorFormatter(Logger.CONSOLE_FORMAT,
+                                              use_color=use_color)
+            record = logging.LogRecord('test', logging.WARNING, __file__, 1,
+                                       "Test %d", (1,), None)
+            relative_created = record.relativeCreated
+            message = formatter.format(record)
+            self.assertRegexpMatches(message, r'Test 1')
+            self.assertEqual(record.levelname, 'WARNING')
+            self.assertEqual(record.relativeCreated, relative_created)
+
+    def test_formatter_uses_time(self):
+        """Test the formatter still fills in the time if the format asks
+        """
+        formatter = Logger.ColorFormatter("%(asctime)s %(message)s",
+                                          use_color=False)
+        record = logging.LogRecord('test', logging.WARNING, __file__, 1,
+                                   "Test", None, None)
+        self.assertTrue(formatter.usesTime())
+        self.assertRegexpMatches(formatter.format(record), r'^\d{4}-.* Test$')
+        self.assertFalse(Logger.ColorFormatter(Logger.FILE_FORMAT).usesTime())
+
+    def test_detect_color(self):
+        """Test the color detection respects the environment
+        """
+        with mock.patch.dict(os.environ, {'CLICOLOR_FORCE': '1'}):
+            self.assertTrue(Logger._detect_color())
+        with mock.patch.dict(os.environ, {'NO_COLOR': ''}):
+            os.environ.pop('CLICOLOR_FORCE', None)
+            self.assertFalse(Logger._detect_color())
+
     def test_file_logger_writes_to_file(self):
         """Test logging to file writes something to the log file
         """
@@ -114,6 +151,22 @@ class TestLogger(unittest.TestCase):
             # The content should match the logged message
             self.assertRegexpMatches(str(lines[0]), r'Test: 3.1415')
 
+    def test_file_handler_buffers_batch(self):
+        """Test the file handler keeps a batch in its buffer until flushed
+        """
+        with tempfile.NamedTemporaryFile() as temp:
+            handler = Logger.BatchRotatingFileHandler(temp.name,
+                                                      encoding='utf-8')
+            handler.stream.write('x' * (Logger.BatchRotatingFileHandler
+                                        .BUFFER_SIZE // 2))
+            self.assertEqual(os.path.getsize(temp.name), 0)
+
+            handler.flush_batch()
+            self.assertEqual(
+                os.path.getsize(temp.name),
+                Logger.BatchRotatingFileHandler.BUFFER_SIZE // 2)
+            handler.close()
+
     def test_file_logger_logs_exception(self):
         """Test logging to file logs exception info
         """
@@ -134,6 +187,9 @@ class TestLogger(unittest.TestCase):
 
             # The content should match the logged message
             self.assertRegexpMatches(str(lines[0]), r'Exception')
+            # The message should be logged only once
+            self.assertEqual(
+                len([line for line in lines if b'Exception...' in line]), 1)
 
     def test_timing_logger_logs(self):
         """Test timing code logs a message
@@ -234,6 +290,43 @@ class TestLogger(unittest.TestCase):
         self.assertEqual(len(re.findall(r'took 0.01',
                                         self.log_stream.getvalue())), 3)
 
+    def test_print_timings_other_process(self):
+        """Test timings from another process are collected
+        """
+        buf = io.StringIO()
+        log.initialize()
+
+        def target():
+            """Sub-process
+            """
+            with log.timed("Bar", level=None):
+                pass
+
+        with log.timed("Foo", level=None):
+            process = multiprocessing.Process(target=target)
+            process.start()
+            process.join()
+
+        with stdout_redirector(buf):
+            log.print_timings()
+
+        self.assertRegexpMatches(buf.getvalue(), r'\'Foo\'')
+        self.assertRegexpMatches(buf.getvalue(), r'\'Bar\'')
+
+    def test_timing_statistics(self):
+        """Test the timing statistics match the direct computation
+        """
+        samples = [0.3, 0.1, 0.4, 0.1, 0.5, 0.9, 0.2]
+        stats = Logger.TimingStatistics()
+        for sample in samples:
+            stats.add(sample)
+
+        self.assertEqual(stats.count, len(samples))
+        self.assertAlmostEqual(stats.total, sum(samples))
+        self.assertEqual(stats.min, min(samples))
+        self.assertEqual(stats.max, max(samples))
+        self.assertAlmostEqual(stats.median, np.median(samples))
+
 
 if __name__ == '__main__':
     unittest.main()
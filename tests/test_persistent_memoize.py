@@ -150,6 +150,33 @@ class TestPersistentMemoize(unittest.TestCase):
         self.assertEqual(result6, 15)
         self.assertEqual(called[0], 3)
 
+    def test_memoize_cache_keys(self):
+        """Test the arguments map to the same cache keys as before
+        """
+        @persistent_memoize
+        def unary(arg):
+            """Test function..."""
+            return 2 * arg
+
+        @persistent_memoize
+        def binary(arg1, arg2):
+            """Test function..."""
+            return arg1 + arg2
+
+        @persistent_memoize
+        def keywords(arg1=0, arg2=1):
+            """Test function..."""
+            return arg1 + arg2
+
+        unary(3)
+        binary(1, 2)
+        keywords(2, arg2=3)
+        caches = [state[key] for key in state
+                  if key.startswith(PersistentCache.KEY_PREFIX)]
+        self.assertIn({3: 6}, caches)
+        self.assertIn({(1, 2): 3}, caches)
+        self.assertIn({((2,), frozenset([('arg2', 3)])): 5}, caches)
+
     def test_memoizes_two_functions(self):
         """Test if memoization works with several functions
         """
@@ -78,6 +78,17 @@ class PrinterTest(object):
         self.assertRegexpMatches(  # pylint: disable=no-member
             buf.getvalue(), r'.*%s.*' % (message % arguments))
 
+    def test_message_without_args(self):
+        """Test printing without arguments prints the message unchanged
+        """
+        buf = io.StringIO()
+        with stdout_redirector(buf):
+            self.printer("100% done")
+
+        # We will get the assertion later (by dependency injection)
+        self.assertRegexpMatches(  # pylint: disable=no-member
+            buf.getvalue(), "100% done")
+
 
 def create_printer_check(color_):
     """Factory for printer tests
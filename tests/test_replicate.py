@@ -20,7 +20,6 @@ if True:  # Ugly, but makes pylint happy
 from pyexperiment import state
 from pyexperiment import Logger
 from pyexperiment import log
-# from pyexperiment.utils.stdout_redirector import stdout_err_redirector
 from pyexperiment.replicate import replicate, collect_results, TargetCreator
 from pyexperiment.replicate import SUBSTATE_KEY_PATTERN
 
@@ -56,6 +55,12 @@ def experiment4():
     state['result'] = np.random.rand(1)
 
 
+def experiment5():
+    """Test experiment, needs to be defined at top level for multiprocessing
+    """
+    state['__result'] = "bla"
+
+
 class TestReplicate(unittest.TestCase):
     """Test the replicate function, serial and parallel
     """
@@ -112,28 +117,40 @@ class TestReplicate(unittest.TestCase):
         for i in range(no_replicates):
             self.assertNotIn(SUBSTATE_KEY_PATTERN % i + '.result', state)
 
-    # Does not work properly yet
-    # def test_raises_parallel(self):
-    #     """Test raising exception in parallel (should log error)
-    #     """
-    #     log_stream = io.StringIO()
-    #     buf_out = io.StringIO()
-    #     buf_err = io.StringIO()
-    #     Logger.CONSOLE_STREAM_HANDLER = logging.StreamHandler(log_stream)
-    #     log.reset_instance()
-    #     log.initialize(console_level=logging.ERROR)
-    #     no_replicates = 2
-    #     with stdout_err_redirector(buf_out, buf_err):
-    #         try:
-    #             replicate(experiment3, no_replicates, parallel=True)
-    #         except:
-    #             pass
-    #     log.close()
-    #     # Should have logged errors
-    #     # self.assertNotEqual(len(log_stream.getvalue()), 0)
-    #     print("log", log_stream.getvalue())
-    #     print("out", buf_out.getvalue())
-    #     print("err", buf_err.getvalue())
+    @unittest.skipIf(getattr(multiprocessing, 'get_start_method',
+                             lambda: 'fork')() != 'fork',
+                     "Closures are only inherited by forked processes")
+    def test_closure_parallel(self):
+        """Test replicating a closure in parallel
+        """
+        no_replicates = 5
+        value = np.arange(10)
+
+        def closure():
+            """Closure that cannot be pickled
+            """
+            state['result'] = value
+
+        replicate(closure, no_replicates, parallel=True, no_processes=2)
+        for i in range(no_replicates):
+            np.testing.assert_array_equal(
+                state[SUBSTATE_KEY_PATTERN % i]['result'], value)
+
+    def test_raises_parallel(self):
+        """Test an exception in a parallel replicate is raised again
+        """
+        log_stream = io.StringIO()
+        Logger.CONSOLE_STREAM_HANDLER = logging.StreamHandler(log_stream)
+        log.reset_instance()
+        log.initialize(console_level=logging.FATAL)
+        no_replicates = 2
+        self.assertRaises(RuntimeError,
+                          replicate,
+                          experiment3,
+                          no_replicates,
+                          parallel=True,
+                          no_processes=2)
+        log.close()
 
     def test_collecting(self):
         """Test collecting results
@@ -167,6 +184,18 @@ class TestReplicate(unittest.TestCase):
                 if not i == k:
                     self.assertFalse((r_1 == r_2).all())
 
+    def test_collecting_global_key(self):
+        """Test collecting results stored under keys outside the substates
+        """
+        no_replicates = 3
+
+        replicate(experiment5, no_replicates)
+        self.assertNotIn(SUBSTATE_KEY_PATTERN % 0 + '.__result', state)
+
+        results = collect_results('__result', no_replicates=no_replicates)
+        self.assertEqual(results, ["bla"] * no_replicates)
+
+
 
 class TestTargetCreator(unittest.TestCase):
     """Test the target creator
@@ -184,14 +213,12 @@ class TestTargetCreator(unittest.TestCase):
         log.reset_instance()
         log.initialize(console_level=logging.DEBUG)
 
-        queue = multiprocessing.Queue()
-        target_fun = TargetCreator(lambda: None, queue, 'bla')
+        target_fun = TargetCreator(lambda: None, 'bla')
         target_fun()
 
         # Should have logged running
         self.assertNotEqual(len(log_stream.getvalue()), 0)
         self.assertRegexpMatches(log_stream.getvalue(), r'Running bla')
-        self.assertTrue(queue.get())
 
     def test_partial(self):
         """Test the basic function of the TargetCreator on a partial target
@@ -206,16 +233,12 @@ class TestTargetCreator(unittest.TestCase):
             """
             pass
 
-        queue = multiprocessing.Queue()
-        target_fun = TargetCreator(functools.partial(target, None),
-                                   queue,
-                                   'bla')
+        target_fun = TargetCreator(functools.partial(target, None), 'bla')
         target_fun()
 
         # Should have logged running
         self.assertNotEqual(len(log_stream.getvalue()), 0)
         self.assertRegexpMatches(log_stream.getvalue(), r'Running bla')
-        self.assertTrue(queue.get())
 
     def test_raises_exception(self):
         """Test the TargetCreator with a function that raises an exception
@@ -230,8 +253,7 @@ class TestTargetCreator(unittest.TestCase):
         log.reset_instance()
         log.initialize(console_level=logging.DEBUG)
 
-        queue = multiprocessing.Queue()
-        target_fun = TargetCreator(target, queue, 'bla')
+        target_fun = TargetCreator(target, 'bla')
         self.assertRaises(RuntimeError, target_fun)
 
         # Should have logged running
@@ -240,7 +262,6 @@ class TestTargetCreator(unittest.TestCase):
         self.assertRegexpMatches(log_stream.getvalue(),
                                  r'Error in sub-process')
         self.assertRegexpMatches(log_stream.getvalue(), r'RuntimeError: bla')
-        self.assertTrue(queue.get())
 
 
 if __name__ == '__main__':
@@ -168,6 +168,26 @@ class TestDelegatedSingleton(unittest.TestCase):
         delegated.reset_instance()
         self.assertEqual(SingletonTest.get_instance().memory, [])
 
+    def test_delegated_after_class_reset(self):
+        """Test the delegated singleton uses the new instance after a reset
+        on the class
+        """
+        class SingletonTest(Singleton):
+            """Singleton test class
+            """
+            def __init__(self):
+                """Initializer
+                """
+                self.memory = []
+
+        delegated = delegate_singleton(SingletonTest)
+        delegated.memory.append(12)
+        self.assertEqual(delegated.memory, [12])
+
+        SingletonTest.reset_instance()
+        self.assertEqual(delegated.memory, [])
+        self.assertIs(delegated.get_instance(), SingletonTest.get_instance())
+
     def test_delegate_singleton_repr(self):
         """Test calling the repr method on a delegated singleton
         """
@@ -182,6 +202,23 @@ class TestDelegatedSingleton(unittest.TestCase):
         singleton = delegate_singleton(FooSingleton)
         self.assertEqual(singleton.__repr__(), "foo")
 
+    def test_delegate_singleton_reused(self):
+        """Test delegating the same singleton twice returns the same delegate
+        """
+        class FooSingleton(Singleton):
+            """Singleton test class
+            """
+            pass
+
+        class BarSingleton(Singleton):
+            """Singleton test class
+            """
+            pass
+
+        singleton = delegate_singleton(FooSingleton)
+        self.assertIs(delegate_singleton(FooSingleton), singleton)
+        self.assertIsNot(delegate_singleton(BarSingleton), singleton)
+
     def test_delegate_singleton_dir(self):
         """Test calling the dir method on a delegated singleton
         """
@@ -371,6 +371,26 @@ class TestStateIO(StateTester):
             self.assertIn('a.b', state)
             self.assertEqual(state['a.b'], 12)
 
+    def test_get_section_lazy_keeps_changes(self):
+        """Test getting a section lazily keeps values changed after loading
+        """
+        state['a.b'] = 12
+        state['a.c'] = 13
+
+        with tempfile.NamedTemporaryFile() as temp:
+            state.save(temp.name)
+            state.reset_instance()
+
+            state.load(temp.name)
+            state['a.b'] = 14
+            state['a.d'] = 15
+
+            section_a = state['a']
+            self.assertEqual(section_a['b'], 14)
+            self.assertEqual(section_a['c'], 13)
+            self.assertEqual(section_a['d'], 15)
+            state.close_file()
+
     def test_lazy_really_lazy(self):
         """Test lazy loading is really lazy
         """
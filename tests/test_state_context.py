@@ -8,6 +8,7 @@ from __future__ import division
 from __future__ import absolute_import
 
 import unittest
+import tempfile
 import threading
 import multiprocessing
 from six import StringIO
@@ -86,6 +87,24 @@ class TestSubStateContext(unittest.TestCase):
             self.assertEqual(state['a.a'], 12)
             self.assertEqual(state['a.b'], 13)
 
+    def test_get_lazy(self):
+        """Test getting lazily loaded sub-state
+        """
+        state['test.a'] = 12
+        with tempfile.NamedTemporaryFile() as temp:
+            state.save(temp.name)
+            state.reset_instance()
+            state.load(temp.name, lazy=True)
+
+            with substate_context('test'):
+                self.assertEqual(state['a'], 12)
+                state['b'] = 13
+
+            self.assertEqual(state['test.a'], 12)
+            self.assertEqual(state['test.b'], 13)
+            self.assertNotIn('test.test.a', state)
+            state.close_file()
+
     def test_get_nonexisting(self):
         """Test getting an item of the state that does not exist
         """